@@ -0,0 +1,204 @@
+# pyright: reportUnusedCallResult=false
+import os
+import time
+import shutil
+from .install import register_commands
+from .pimconfig import DEV_SYNC_INTERVAL
+from .util.fs import remove_tree
+from .devregistry import registry_path
+from .util.jsonfile import load_json, save_json
+from .util.prompt import prompt_yes_no
+
+MARKER_NAME = ".pim-dev"
+IGNORED_DIRS = {"__pycache__", ".git"}
+
+def _snapshot(src: str) -> dict[str, tuple[int, int]]:
+    """Map each file under `src` (relative path) to its (mtime_ns, size)."""
+    snap: dict[str, tuple[int, int]] = {}
+    for root, dirs, files in os.walk(src):
+        dirs[:] = [d for d in dirs if d not in IGNORED_DIRS]
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            snap[os.path.relpath(path, src)] = (st.st_mtime_ns, st.st_size)
+    return snap
+
+def _sync_files(src: str, dst: str, old: dict[str, tuple[int, int]] | None, keep: set[str]) -> tuple[dict[str, tuple[int, int]], int]:
+    """
+    Copy files changed since the `old` snapshot (or differing from `dst` when there is
+    none) and delete files removed from `src`. Without a snapshot, every file in `dst`
+    missing from `src` is deleted, except the relative paths in `keep`.
+    Returns (new snapshot, files changed).
+    """
+    new = _snapshot(src)
+    changed = 0
+    for rel, stamp in new.items():
+        d = os.path.join(dst, rel)
+        if old is not None:
+            if old.get(rel) == stamp:
+                continue
+        else:
+            try:
+                st = os.stat(d)
+                # copy2 keeps mtimes, so an already synced file matches exactly
+                if (st.st_mtime_ns, st.st_size) == stamp:
+                    continue
+            except OSError:
+                pass
+        os.makedirs(os.path.dirname(d), exist_ok=True)
+        shutil.copy2(os.path.join(src, rel), d)
+        changed += 1
+    removed = old.keys() - new.keys() if old is not None else _snapshot(dst).keys() - new.keys() - keep
+    for rel in removed:
+        try:
+            os.remove(os.path.join(dst, rel))
+            changed += 1
+        except OSError:
+            pass
+    return new, changed
+
+def _keep(pkg_name: str) -> set[str]:
+    """Files pim adds to a copied editable install, which sync must not delete."""
+    return {MARKER_NAME, f"{pkg_name}.info"}
+
+def install_editable(
+    src_dir: str,
+    target: str,
+    force: bool = False,
+    nocfg: bool = False,
+    auto_add_cmd_path: bool = False,
+    copy: bool = False
+):
+    """
+    Install a local package folder for development: `pkg/<name>` becomes a link to
+    `src_dir`, so edits are visible in game immediately. Where links are not possible
+    (or with `copy`) the folder is copied instead and kept up to date with
+    `pim dev sync --watch`.
+    """
+    src = os.path.abspath(src_dir)
+    if not os.path.isdir(src):
+        print(f"'{src_dir}' is not a directory.")
+        return 1
+    pkg_name = os.path.basename(src)
+    final_path = os.path.join(target, pkg_name)
+
+    # replacing final_path must never delete the source folder itself
+    real_src = os.path.realpath(src)
+    real_target = os.path.realpath(target)
+    same_link = not copy and os.path.islink(final_path) and os.path.realpath(final_path) == real_src
+    if (not same_link and os.path.realpath(final_path) == real_src) or os.path.commonpath([real_src, real_target]) == real_target:
+        print(f"'{src_dir}' is inside the target folder {target}; move it elsewhere to install it as editable.")
+        return 1
+    if os.path.lexists(final_path) and not same_link:
+        if not force:
+            print(f"Package '{pkg_name}' is already installed in {final_path}.")
+            ok = prompt_yes_no("Do you want to replace it with an editable install? [y/N]", default=False)
+            if not ok:
+                print("Installation cancelled.")
+                return 0
+        else:
+            print(f"Package '{pkg_name}' already exists in {final_path}. Force enabled: will overwrite.")
+
+    mode = "copy" if copy else "link"
+    try:
+        if os.path.lexists(final_path) and not same_link:
+            remove_tree(final_path)
+        os.makedirs(target, exist_ok=True)
+    except Exception as e:
+        print(f"Error installing package: {e}")
+        return 1
+
+    if mode == "link" and not same_link:
+        try:
+            os.symlink(src, final_path, target_is_directory=True)
+        except OSError:
+            # e.g. Windows without symlink permission
+            mode = "copy"
+
+    if mode == "copy":
+        try:
+            _sync_files(src, final_path, None, _keep(pkg_name))
+            with open(os.path.join(final_path, MARKER_NAME), "w", encoding="utf-8") as f:
+                f.write(src)
+        except Exception as e:
+            print(f"Error installing package: {e}")
+            return 1
+
+    # Write a minimal .info if the package has none yet, so pim lists it
+    info_path = os.path.join(final_path, f"{pkg_name}.info")
+    if not os.path.exists(info_path):
+        try:
+            with open(info_path, "w", encoding="utf-8") as f:
+                f.write(f"name: {pkg_name}\nversion: 0.0.0-dev")
+            print(f"Created {pkg_name}.info" + (f" in {src}" if mode == "link" else ""))
+        except Exception as e:
+            # without it pim would not list the package
+            print(f"Error writing {info_path}: {e}")
+            return 1
+
+    registry = load_json(registry_path(target))
+    registry[pkg_name] = {"source": src, "mode": mode}
+    save_json(registry_path(target), registry)
+
+    if mode == "link":
+        print(f"Package '{pkg_name}' linked: {final_path} -> {src}")
+    else:
+        print(f"Package '{pkg_name}' copied to {final_path}" + ("." if copy else " (links not available)."))
+        print("Run 'pim dev sync --watch' to keep it up to date while you edit.")
+
+    register_commands(pkg_name, final_path, target, nocfg=nocfg, auto_add_cmd_path=auto_add_cmd_path)
+    return 0
+
+def dev_sync(target: str, names: list[str], watch: bool = False, interval: float = DEV_SYNC_INTERVAL):
+    """
+    Copy changed files of copied editable installs from their source folders. With
+    `watch`, keep polling mtimes every `interval` seconds until interrupted.
+    """
+    registry = load_json(registry_path(target))
+    pairs: list[tuple[str, str, str]] = []
+    for name, entry in registry.items():
+        if names and name not in names:
+            continue
+        if not isinstance(entry, dict):
+            continue
+        src = entry.get("source") # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
+        dst = os.path.join(target, name)
+        if not isinstance(src, str):
+            continue
+        if os.path.islink(dst):
+            continue # linked installs are always up to date
+        if not os.path.isfile(os.path.join(dst, MARKER_NAME)):
+            print(f"Skipping '{name}': no longer an editable install.")
+            continue
+        if not os.path.isdir(src):
+            print(f"Skipping '{name}': source folder {src} not found.")
+            continue
+        pairs.append((name, src, dst))
+
+    missing = [n for n in names if n not in registry]
+    if missing:
+        print(f"Not editable installs: {', '.join(missing)}")
+    if not pairs:
+        print("Nothing to sync.")
+        return 0
+
+    snapshots: dict[str, dict[str, tuple[int, int]] | None] = {name: None for name, _, _ in pairs}
+    try:
+        while True:
+            for name, src, dst in pairs:
+                try:
+                    snapshots[name], changed = _sync_files(src, dst, snapshots[name], _keep(name))
+                except Exception as e:
+                    print(f"Error syncing '{name}': {e}")
+                    continue
+                if changed:
+                    print(f"[{time.strftime('%H:%M:%S')}] {name}: {changed} file(s) synced")
+            if not watch:
+                break
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+    return 0
@@ -0,0 +1,18 @@
+import os
+from .util.jsonfile import load_json, save_json
+
+REGISTRY_NAME = ".pim-dev.json"
+
+def registry_path(target: str) -> str:
+    """Path of the file recording the editable installs of `target`."""
+    return os.path.join(target, REGISTRY_NAME)
+
+def editable_packages(target: str) -> set[str]:
+    """Names of the editable installs recorded in `target`."""
+    return set(load_json(registry_path(target)).keys())
+
+def unregister_editable(pkg_name: str, target: str):
+    """Forget an editable install (on uninstall, or when a repo install replaces it)."""
+    registry = load_json(registry_path(target))
+    if registry.pop(pkg_name, None) is not None:
+        save_json(registry_path(target), registry)
@@ -1,18 +1,45 @@
+import time
 import urllib.request
 import urllib.error
 from http.client import HTTPResponse
 from .util.url import url_join
 from .pimconfig import FETCH_TIMEOUT
+from .repostats import rank_repos, mirror_group, record_success, record_failure
+from .infocache import fetch_info_text
+
+class ReposUnreachableError(Exception):
+    """No repo answered a lookup (all failed or are skipped by the circuit breaker)."""
+
+def _not_found(base: str, e: urllib.error.HTTPError, latency: float) -> bool:
+    """
+    Record an HTTP error from `base`. Returns True only if it means the package does
+    not exist there (404/410), which equivalent mirrors would answer the same. Rate
+    limits and server errors count as repo failures; other codes (401, 403, ...) are
+    neither, and the next mirror is tried.
+    """
+    if e.code in (404, 410):
+        record_success(base, latency)
+        return True
+    if e.code == 429 or e.code >= 500:
+        record_failure(base)
+    return False
 
 def find_pkg_in_repos(pkg_name: str, repos: list[str]) -> tuple[str,str,str] | None:
     zip_name = f"{pkg_name}.zip"
     info_name = f"{pkg_name}.info"
-    for base in repos:
+    answered: set[str] = set() # repos whose mirror group already said "not found"
+    reached = False
+    for base in rank_repos(repos):
+        if base in answered:
+            continue
         zip_url = url_join(base, zip_name)
         info_url = url_join(base, info_name)
+        start = time.monotonic()
         try:
             with urllib.request.urlopen(info_url, timeout=FETCH_TIMEOUT) as resp: # pyright: ignore[reportAny]
                 if not isinstance(resp, HTTPResponse): return None
+                reached = True
+                record_success(base, time.monotonic() - start)
                 if resp.status == 200:
                     try:
                         with urllib.request.urlopen(zip_url, timeout=FETCH_TIMEOUT) as zresp: # pyright: ignore[reportAny]
@@ -20,8 +47,47 @@ def find_pkg_in_repos(pkg_name: str, repos: list[str]) -> tuple[str,str,str] | N
                                 return base, zip_url, info_url
                     except urllib.error.HTTPError:
                         continue
-        except urllib.error.HTTPError:
+        except urllib.error.HTTPError as e:
+            if _not_found(base, e, time.monotonic() - start):
+                reached = True
+                answered.update(mirror_group(base))
+            continue
+        except OSError:
+            # URLError, timeouts, connection resets
+            record_failure(base)
+            continue
+    if not reached:
+        raise ReposUnreachableError("could not reach any repo (see 'pim repo status')")
+    return None
+
+def find_info_in_repos(pkg_name: str, repos: list[str], ranked: bool = False) -> tuple[str,str,str] | None:
+    """
+    Find the .info of `pkg_name` without touching the zip. Returns (base, info_url, info_text),
+    or None if not found. Raises ReposUnreachableError if no repo answered.
+    Pass `ranked=True` when `repos` already comes from `rank_repos` (e.g. when checking
+    many packages concurrently), so the ranking and its messages happen only once.
+    """
+    info_name = f"{pkg_name}.info"
+    answered: set[str] = set()
+    reached = False
+    for base in (repos if ranked else rank_repos(repos)):
+        if base in answered:
+            continue
+        info_url = url_join(base, info_name)
+        start = time.monotonic()
+        try:
+            info_text = fetch_info_text(info_url)
+            reached = True
+            record_success(base, time.monotonic() - start)
+            return base, info_url, info_text
+        except urllib.error.HTTPError as e:
+            if _not_found(base, e, time.monotonic() - start):
+                reached = True
+                answered.update(mirror_group(base))
             continue
-        except urllib.error.URLError:
+        except OSError:
+            record_failure(base)
             continue
+    if not reached:
+        raise ReposUnreachableError("could not reach any repo (see 'pim repo status')")
     return None
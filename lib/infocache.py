@@ -0,0 +1,52 @@
+import threading
+import urllib.request
+import urllib.error
+from .pimconfig import INFO_CACHE_PATH, FETCH_TIMEOUT
+from .util.jsonfile import load_json, save_json
+
+_lock = threading.Lock()
+_cache: dict[str, dict[str, object]] | None = None
+
+def _all_cached() -> dict[str, dict[str, object]]:
+    global _cache
+    if _cache is None:
+        _cache = {k: v for k, v in load_json(INFO_CACHE_PATH).items() if isinstance(v, dict)} # pyright: ignore[reportUnknownVariableType]
+    return _cache
+
+def fetch_info_text(info_url: str) -> str:
+    """
+    Fetch a .info file, revalidating the cached copy with If-None-Match /
+    If-Modified-Since so an unchanged entry costs a bodiless 304 response.
+    Raises urllib.error.HTTPError (e.g. 404) and other network errors as urlopen does.
+    """
+    with _lock:
+        cached = dict(_all_cached().get(info_url, {}))
+
+    req = urllib.request.Request(info_url)
+    text = cached.get("text")
+    if isinstance(text, str):
+        etag = cached.get("etag")
+        last_modified = cached.get("last_modified")
+        if isinstance(etag, str):
+            req.add_header("If-None-Match", etag)
+        if isinstance(last_modified, str):
+            req.add_header("If-Modified-Since", last_modified)
+
+    try:
+        with urllib.request.urlopen(req, timeout=FETCH_TIMEOUT) as resp: # pyright: ignore[reportAny]
+            text = resp.read().decode("utf-8") # pyright: ignore[reportAny]
+            etag = resp.headers.get("ETag") # pyright: ignore[reportAny]
+            last_modified = resp.headers.get("Last-Modified") # pyright: ignore[reportAny]
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and isinstance(text, str):
+            return text
+        raise
+
+    with _lock:
+        cache = _all_cached()
+        if etag or last_modified:
+            cache[info_url] = {"etag": etag, "last_modified": last_modified, "text": text}
+        else:
+            cache.pop(info_url, None)
+        save_json(INFO_CACHE_PATH, dict(cache))
+    return text
@@ -5,52 +5,66 @@ import tempfile
 import shutil
 import zipfile
 from .download import download_to_temp
-from .find import find_pkg_in_repos
+from .find import find_pkg_in_repos, ReposUnreachableError
 from .parse import parse_info_text
+from .devregistry import unregister_editable
+from .store import store_lock, zip_validators, store_lookup, store_add, object_path, link_tree, add_ref
 from .msconfig.path.command import cfg_add_command_path
 from .util.prompt import prompt_yes_no
+from .util.fs import remove_tree
 
-def install_package(
-    pkg_name: str,
-    repos: list[str],
-    target: str,
-    force: bool = False,
-    nocfg: bool = False,
-    auto_add_cmd_path: bool = False
-):
-    pkg = find_pkg_in_repos(pkg_name, repos)
-    if not pkg: 
-        print(f"Package '{pkg_name}' not found in the configured repos.")
-        return 1
+def _link_from_store(pkg_hash: str, final_path: str) -> str:
+    """Replace `final_path` with links to a stored package. The caller holds store_lock()."""
+    if os.path.lexists(final_path):
+        # remove destination to replace
+        remove_tree(final_path)
+    mode = link_tree(object_path(pkg_hash), final_path)
+    add_ref(pkg_hash, final_path)
+    return mode
 
-    base, zip_url, info_url = pkg
-    print(f"Package found in: {base}")
+def _install_from_store(pkg_name: str, zip_url: str, info: dict[str, str], info_text: str, final_path: str) -> int:
+    """Install through the global store: extract each version once, then link it into `final_path`."""
+    # without a declared sha256, check the zip wasn't republished since it was stored
+    validators = {} if info.get("sha256") else zip_validators(zip_url)
+    try:
+        with store_lock():
+            pkg_hash = store_lookup(zip_url, info, info_text, validators)
+            if pkg_hash:
+                print(f"Package '{pkg_name}' found in store ({pkg_hash[:12]}).")
+                mode = _link_from_store(pkg_hash, final_path)
+                print(f"Linked from store ({mode}).")
+                return 0
+    except Exception as e:
+        print(f"Error installing package: {e}")
+        return 1
 
-    # download info
-    # TODO: fix this
+    # download outside the lock, so other instances aren't blocked meanwhile
     try:
-        info_temp = download_to_temp(info_url, desc=f"{pkg_name}.info")
-        with open(info_temp, "r", encoding="utf-8") as f:
-            info_text = f.read()
-        info = parse_info_text(info_text)
+        zip_temp = download_to_temp(zip_url, desc=f"{pkg_name}.zip")
+    except Exception as e:
+        print(f"Error downloading {zip_url}: {e}")
+        return 1
+    try:
+        with store_lock():
+            try:
+                pkg_hash = store_add(zip_temp, pkg_name, zip_url, info, info_text, validators)
+            except zipfile.BadZipFile:
+                print("Invalid zip file.")
+                return 1
+            except Exception as e:
+                print(f"Error adding package to store: {e}")
+                return 1
+            mode = _link_from_store(pkg_hash, final_path)
+    except Exception as e:
+        print(f"Error installing package: {e}")
+        return 1
     finally:
-        if 'info_temp' in locals() and os.path.exists(info_temp):
-            os.remove(info_temp)
-
-    # Prepare paths
-    final_path = os.path.join(target, pkg_name)
-
-    # If it already exists, ask the user (unless force=True)
-    if os.path.exists(final_path):
-        if not force:
-            print(f"Package '{pkg_name}' is already installed in {final_path}.")
-            ok = prompt_yes_no("Do you want to reinstall and overwrite it? [y/N]", default=False)
-            if not ok:
-                print("Installation cancelled.")
-                return 0
-        else:
-            print(f"Package '{pkg_name}' already exists in {final_path}. Force enabled: will overwrite.")
+        if os.path.exists(zip_temp):
+            os.remove(zip_temp)
+    print(f"Linked from store ({mode}).")
+    return 0
 
+def _install_from_zip(pkg_name: str, zip_url: str, final_path: str) -> int:
     # download zip
     try:
         zip_temp = download_to_temp(zip_url, desc=f"{pkg_name}.zip")
@@ -72,9 +86,9 @@ def install_package(
     # move to destination (respecting if zip contains top-level folder pkg_name)
     candidate = os.path.join(tmpdir, pkg_name)
     try:
-        if os.path.isdir(final_path):
+        if os.path.lexists(final_path):
             # remove destination to replace
-            shutil.rmtree(final_path)
+            remove_tree(final_path)
         if os.path.isdir(candidate):
             shutil.move(candidate, final_path)
         else:
@@ -93,22 +107,10 @@ def install_package(
         shutil.rmtree(tmpdir, ignore_errors=True)
         if os.path.exists(zip_temp):
             os.remove(zip_temp)
+    return 0
 
-    # Save info inside the installed package
-    try:
-        info_lines: list[str] = []
-        for k, v in info.items():
-            if k == "description" and "\n" in v:
-                info_lines.append(f"description: {v}")
-            else:
-                info_lines.append(f"{k}: {v}")
-        with open(os.path.join(final_path, f"{pkg_name}.info"), "w", encoding="utf-8") as f:
-            f.write("\n".join(info_lines))
-    except Exception:
-        pass
-
-    print(f"Package '{pkg_name}' installed in {final_path}.")
-
+def register_commands(pkg_name: str, final_path: str, target: str, nocfg: bool = False, auto_add_cmd_path: bool = False):
+    """Offer to add the package's `commands/` folder to command_path in config.txt."""
     # Detect commands/ folder inside the package
     commands_dir = os.path.join(final_path, "commands")
     if os.path.isdir(commands_dir):
@@ -137,4 +139,80 @@ def install_package(
                     print("Not modifying config.txt. To enable these commands, add the following line or path to command_path:")
                     print(f"  {pkg_name}/commands")
 
+def install_package(
+    pkg_name: str,
+    repos: list[str],
+    target: str,
+    force: bool = False,
+    nocfg: bool = False,
+    auto_add_cmd_path: bool = False,
+    use_store: bool = False
+):
+    try:
+        pkg = find_pkg_in_repos(pkg_name, repos)
+    except ReposUnreachableError as e:
+        print(f"Cannot look up '{pkg_name}': {e}.")
+        return 1
+    if not pkg: 
+        print(f"Package '{pkg_name}' not found in the configured repos.")
+        return 1
+
+    base, zip_url, info_url = pkg
+    print(f"Package found in: {base}")
+
+    # download info
+    # TODO: fix this
+    try:
+        info_temp = download_to_temp(info_url, desc=f"{pkg_name}.info")
+        with open(info_temp, "r", encoding="utf-8") as f:
+            info_text = f.read()
+        info = parse_info_text(info_text)
+    finally:
+        if 'info_temp' in locals() and os.path.exists(info_temp):
+            os.remove(info_temp)
+
+    # Prepare paths
+    final_path = os.path.join(target, pkg_name)
+
+    # If it already exists, ask the user (unless force=True)
+    if os.path.exists(final_path):
+        if not force:
+            print(f"Package '{pkg_name}' is already installed in {final_path}.")
+            ok = prompt_yes_no("Do you want to reinstall and overwrite it? [y/N]", default=False)
+            if not ok:
+                print("Installation cancelled.")
+                return 0
+        else:
+            print(f"Package '{pkg_name}' already exists in {final_path}. Force enabled: will overwrite.")
+
+    if use_store:
+        rc = _install_from_store(pkg_name, zip_url, info, info_text, final_path)
+    else:
+        rc = _install_from_zip(pkg_name, zip_url, final_path)
+    if rc:
+        return rc
+    # a repo install replaces an editable install of the same name
+    unregister_editable(pkg_name, target)
+
+    # Save info inside the installed package
+    try:
+        info_lines: list[str] = []
+        for k, v in info.items():
+            if k == "description" and "\n" in v:
+                info_lines.append(f"description: {v}")
+            else:
+                info_lines.append(f"{k}: {v}")
+        info_path = os.path.join(final_path, f"{pkg_name}.info")
+        # never write through a link into the store
+        if os.path.lexists(info_path):
+            os.remove(info_path)
+        with open(info_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(info_lines))
+    except Exception:
+        pass
+
+    print(f"Package '{pkg_name}' installed in {final_path}.")
+
+    register_commands(pkg_name, final_path, target, nocfg=nocfg, auto_add_cmd_path=auto_add_cmd_path)
+
     return 0
@@ -1,33 +1,31 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
+from .devregistry import editable_packages
+from .find import find_info_in_repos, ReposUnreachableError
 from .parse import parse_info_text
+from .pimconfig import FETCH_WORKERS
+from .repostats import rank_repos
+from .version import compare_versions
 
-def list_installed(target: str):
+def installed_packages(target: str) -> list[tuple[str, str | None]]:
     """
-    List only directories inside `target` that look like pim-installed packages.
-    A package is considered installed if there is a file named `<pkgname>.info`
+    Return (name, version) for directories inside `target` that look like pim-installed
+    packages. A package is considered installed if there is a file named `<pkgname>.info`
     inside the package directory. This avoids listing unrelated folders.
     """
     if not os.path.exists(target):
-        print("No packages installed.")
-        return 0
-        
+        return []
+
     candidates = sorted(
         name for name in os.listdir(target)
         if os.path.isdir(os.path.join(target, name))
     )
 
-    packages: list[tuple[str, str]] = []
+    packages: list[tuple[str, str | None]] = []
     for name in candidates:
         info_path = os.path.join(target, name, f"{name}.info")
-        if os.path.isfile(info_path):
-            packages.append((name, info_path))
-
-    if not packages:
-        print("No packages installed.")
-        return 0
-
-    print("Installed packages:")
-    for name, info_path in packages:
+        if not os.path.isfile(info_path):
+            continue
         version = None
         try:
             with open(info_path, "r", encoding="utf-8") as f:
@@ -35,5 +33,68 @@ def list_installed(target: str):
             version = info.get("version")
         except Exception:
             version = None
+        packages.append((name, version))
+    return packages
+
+def list_installed(target: str):
+    packages = installed_packages(target)
+    if not packages:
+        print("No packages installed.")
+        return 0
+
+    print("Installed packages:")
+    for name, version in packages:
         print(f" - {name}" + (f" ({version})" if version else ""))
     return 0
+
+def list_outdated(target: str, repos: list[str]):
+    """
+    Check every installed package against the repos concurrently and list those with a
+    newer version available. Unchanged .info files are revalidated with conditional
+    requests, so the whole check costs about one round trip. Editable installs are
+    local development copies and are not checked.
+    """
+    editable = editable_packages(target)
+    packages = [(name, version) for name, version in installed_packages(target) if name not in editable]
+    if not packages:
+        print("No packages installed." if not editable else "No packages to check (only editable installs).")
+        return 0
+
+    ranked = rank_repos(repos)
+
+    def check(name: str) -> str | None:
+        found = find_info_in_repos(name, ranked, ranked=True)
+        if not found:
+            return None
+        return parse_info_text(found[2]).get("version")
+
+    with ThreadPoolExecutor(max_workers=max(1, min(FETCH_WORKERS, len(packages)))) as pool:
+        futures = [(name, version, pool.submit(check, name)) for name, version in packages]
+
+    outdated: list[tuple[str, str, str]] = []
+    missing: list[str] = []
+    unreachable: list[str] = []
+    for name, version, future in futures:
+        try:
+            latest = future.result()
+        except ReposUnreachableError:
+            unreachable.append(name)
+            continue
+        except Exception:
+            latest = None
+        if latest is None:
+            missing.append(name)
+        elif version is None or compare_versions(version, latest) < 0:
+            outdated.append((name, version or "unknown", latest))
+
+    if outdated:
+        print("Outdated packages:")
+        for name, version, latest in outdated:
+            print(f" - {name} ({version} -> {latest})")
+    elif not unreachable:
+        print("All packages are up to date.")
+    if missing:
+        print(f"Not found in repos: {', '.join(missing)}")
+    if unreachable:
+        print(f"Could not check (no repo reachable, see 'pim repo status'): {', '.join(unreachable)}")
+    return 0
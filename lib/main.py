@@ -1,22 +1,28 @@
 import argparse
 from . import __version__
-from .pimconfig import DEFAULT_REPOS, DEFAULT_TARGET
+from .pimconfig import DEFAULT_REPOS, DEFAULT_TARGET, USE_STORE
 from .install import install_package
 from .uninstall import uninstall_package
-from .list import list_installed
+from .list import list_installed, list_outdated
 from .show import show_package
+from .store import store_gc, store_list
+from .repostats import repo_status, reset_stats
+from .dev import install_editable, dev_sync
 
 def main(argv: list[str]):
     parser = argparse.ArgumentParser(prog="pim", description=f"Minescript package installer v{__version__}")
     sub = parser.add_subparsers(dest="cmd", required=True)
 
     p_install = sub.add_parser("install", help="Install package")
-    p_install.add_argument("package")
+    p_install.add_argument("package", nargs="?")
+    p_install.add_argument("--editable", "-e", metavar="DIR", help="Link a local package folder for development instead of installing from a repo")
+    p_install.add_argument("--copy", action="store_true", help="With --editable: copy instead of linking (keep in sync with 'pim dev sync --watch')")
     p_install.add_argument("--repo", action="append", help="Base repository URL (can repeat)", default=[])
     p_install.add_argument("--target", help="Installation target path", default=None)
     p_install.add_argument("--yes", "-y", action="store_true", help="Accept overwriting existing packages without asking")
     p_install.add_argument("--no-config", action="store_true", help="Do not modify config.txt or prompt to add command_path")
     p_install.add_argument("--add-command-path", action="store_true", help="Automatically add package commands to config.txt without prompting")
+    p_install.add_argument("--store", action=argparse.BooleanOptionalAction, default=USE_STORE, help="Install through the global package store shared by all instances")
 
     p_show = sub.add_parser("show", help="Show package info (repo or installed)")
     p_show.add_argument("package")
@@ -25,23 +31,63 @@ def main(argv: list[str]):
 
     p_list = sub.add_parser("list", help="List installed packages")
     p_list.add_argument("--target", default=None)
+    p_list.add_argument("--outdated", action="store_true", help="Only list packages with a newer version in the repos")
+    p_list.add_argument("--repo", action="append", default=[])
 
     p_uninstall = sub.add_parser("uninstall", help="Uninstall package")
     p_uninstall.add_argument("package")
     p_uninstall.add_argument("--target", default=None)
 
+    p_store = sub.add_parser("store", help="Manage the global package store")
+    store_sub = p_store.add_subparsers(dest="store_cmd", required=True)
+    store_sub.add_parser("gc", help="Remove stored versions no instance references")
+    store_sub.add_parser("list", help="List stored versions and their references")
+
+    p_repo = sub.add_parser("repo", help="Inspect configured repositories")
+    repo_sub = p_repo.add_subparsers(dest="repo_cmd", required=True)
+    p_repo_status = repo_sub.add_parser("status", help="Show success rate, latency and failures per repo")
+    p_repo_status.add_argument("--repo", action="append", default=[])
+    p_repo_reset = repo_sub.add_parser("reset", help="Forget repo statistics so skipped repos are retried now")
+    p_repo_reset.add_argument("--repo", action="append", default=[], help="Repo to reset (can repeat, default: all)")
+
+    p_dev = sub.add_parser("dev", help="Tools for package authors")
+    dev_sub = p_dev.add_subparsers(dest="dev_cmd", required=True)
+    p_dev_sync = dev_sub.add_parser("sync", help="Copy changed files of copied editable installs")
+    p_dev_sync.add_argument("package", nargs="*", help="Packages to sync (default: all editable installs)")
+    p_dev_sync.add_argument("--watch", "-w", action="store_true", help="Keep watching for changes until interrupted")
+    p_dev_sync.add_argument("--target", default=None)
+
     args = parser.parse_args(argv)
 
     repos = args.repo if getattr(args, "repo", None) else DEFAULT_REPOS
     target = getattr(args, "target", None) or DEFAULT_TARGET
 
     if args.cmd == "install":
-        return install_package(args.package, repos, target, force=args.yes, nocfg=args.no_config, auto_add_cmd_path=args.add_command_path)
+        if args.editable:
+            return install_editable(args.editable, target, force=args.yes, nocfg=args.no_config, auto_add_cmd_path=args.add_command_path, copy=args.copy)
+        if not args.package:
+            p_install.error("the following arguments are required: package (or --editable DIR)")
+        return install_package(args.package, repos, target, force=args.yes, nocfg=args.no_config, auto_add_cmd_path=args.add_command_path, use_store=args.store)
     if args.cmd == "show":
         return show_package(args.package, repos, target)
     if args.cmd == "list":
+        if args.outdated:
+            return list_outdated(target, repos)
         return list_installed(target)
     if args.cmd == "uninstall":
         return uninstall_package(args.package, target)
+    if args.cmd == "store":
+        if args.store_cmd == "gc":
+            return store_gc()
+        if args.store_cmd == "list":
+            return store_list()
+    if args.cmd == "repo":
+        if args.repo_cmd == "status":
+            return repo_status(repos)
+        if args.repo_cmd == "reset":
+            return reset_stats(args.repo)
+    if args.cmd == "dev":
+        if args.dev_cmd == "sync":
+            return dev_sync(target, args.package, watch=args.watch)
     parser.print_help()
     return 1
@@ -1,3 +1,4 @@
+import os
 from .msconfig.filepath import BASE_PATH
 
 DEFAULT_REPOS = [
@@ -10,3 +11,27 @@ PKG_PATH = "pkg"
 DEFAULT_TARGET = BASE_PATH + PKG_PATH
 MAKE_BKP = True
 FETCH_TIMEOUT = 10 # seconds
+
+# Shared data for every Minecraft instance of this user
+PIM_HOME = os.path.join(os.path.expanduser("~"), ".pim")
+
+# Global package store (shared by all instances, keyed by package hash)
+USE_STORE = False # install through the store by default
+STORE_PATH = os.path.join(PIM_HOME, "store")
+STORE_LINK_MODE = "hardlink" # "hardlink", "symlink" or "copy" (links fall back to copy)
+
+# Repository statistics and circuit breaker
+REPO_STATS_PATH = os.path.join(PIM_HOME, "repo_stats.json")
+BREAKER_THRESHOLD = 2 # consecutive failures before a repo is skipped
+BREAKER_COOLDOWN = 300 # seconds a failing repo is skipped
+MIRROR_GROUPS: list[list[str]] = [
+    # Repos serving the same packages, tried fastest-first, e.g.:
+    #["https://example.org/pim/", "https://mirror.example.net/pim/"],
+]
+
+# Cached .info files, revalidated with conditional requests (ETag / Last-Modified)
+INFO_CACHE_PATH = os.path.join(PIM_HOME, "info_cache.json")
+FETCH_WORKERS = 32 # concurrent requests when checking many packages
+
+# Editable installs
+DEV_SYNC_INTERVAL = 0.5 # seconds between mtime polls of `pim dev sync --watch`
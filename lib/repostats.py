@@ -0,0 +1,182 @@
+import time
+import statistics
+import threading
+from collections.abc import Callable
+from .pimconfig import REPO_STATS_PATH, BREAKER_THRESHOLD, BREAKER_COOLDOWN, MIRROR_GROUPS
+from .util.jsonfile import load_json, save_json
+from .util.lock import file_lock
+
+MAX_LATENCIES = 20 # latency samples kept per repo
+LOCK_PATH = REPO_STATS_PATH + ".lock"
+
+_lock = threading.Lock()
+_stats: dict[str, dict[str, object]] | None = None
+
+def _norm(url: str) -> str:
+    return url.rstrip("/")
+
+def _all_stats() -> dict[str, dict[str, object]]:
+    global _stats
+    if _stats is None:
+        _stats = {k: v for k, v in load_json(REPO_STATS_PATH).items() if isinstance(v, dict)} # pyright: ignore[reportUnknownVariableType]
+    return _stats
+
+def _repo_stats(base: str) -> dict[str, object]:
+    return _all_stats().setdefault(_norm(base), {
+        "successes": 0,
+        "failures": 0,
+        "consecutive_failures": 0,
+        "latencies": [],
+        "last_failure": None,
+        "open_until": 0,
+    })
+
+def _update(apply: Callable[[], None]):
+    """
+    Apply a change to the stats shared by every pim process: reload the file under a
+    file lock first, so changes made by other instances (a tripped breaker, a reset)
+    are merged rather than overwritten. Statistics are best-effort, so if the lock
+    can't be taken the change only applies to this process.
+    """
+    global _stats
+    with _lock:
+        try:
+            with file_lock(LOCK_PATH, timeout=5):
+                _stats = None
+                apply()
+                save_json(REPO_STATS_PATH, dict(_all_stats()))
+        except TimeoutError:
+            apply()
+
+def _int(value: object) -> int:
+    return value if isinstance(value, int) else 0
+
+def _latencies(stats: dict[str, object]) -> list[float]:
+    lat = stats.get("latencies")
+    return [x for x in lat if isinstance(x, (int, float))] if isinstance(lat, list) else [] # pyright: ignore[reportUnknownVariableType]
+
+def median_latency(base: str) -> float | None:
+    with _lock:
+        lat = _latencies(_repo_stats(base))
+    return statistics.median(lat) if lat else None
+
+def open_remaining(base: str) -> float:
+    """Seconds left before a tripped repo is tried again (0 if the breaker is closed)."""
+    with _lock:
+        open_until = _repo_stats(base).get("open_until")
+    if not isinstance(open_until, (int, float)):
+        return 0
+    return max(0.0, open_until - time.time())
+
+def record_success(base: str, latency: float):
+    def apply():
+        stats = _repo_stats(base)
+        stats["successes"] = _int(stats.get("successes")) + 1
+        stats["consecutive_failures"] = 0
+        stats["open_until"] = 0
+        stats["latencies"] = (_latencies(stats) + [round(latency, 4)])[-MAX_LATENCIES:]
+    _update(apply)
+
+def record_failure(base: str):
+    """Count a failed request; trip the breaker after BREAKER_THRESHOLD consecutive failures."""
+    def apply():
+        stats = _repo_stats(base)
+        now = time.time()
+        stats["failures"] = _int(stats.get("failures")) + 1
+        stats["consecutive_failures"] = _int(stats.get("consecutive_failures")) + 1
+        stats["last_failure"] = now
+        # a failed probe after the cooldown re-opens the breaker immediately
+        if stats["consecutive_failures"] >= BREAKER_THRESHOLD: # pyright: ignore[reportOperatorIssue]
+            stats["open_until"] = now + BREAKER_COOLDOWN
+    _update(apply)
+
+def mirror_group(base: str) -> list[str]:
+    """Return the repos declared equivalent to `base` (including itself)."""
+    for group in MIRROR_GROUPS:
+        if _norm(base) in (_norm(m) for m in group):
+            return group
+    return [base]
+
+def rank_repos(repos: list[str]) -> list[str]:
+    """
+    Order `repos` for lookups: the configured order is kept, but each mirror group
+    is tried fastest-first (by median latency) at the position of its first member.
+    Repos whose breaker is open are skipped until their cooldown expires, unless all
+    of them are: then the one closest to the end of its cooldown is probed anyway.
+    """
+    ranked: list[str] = []
+    skipped: list[tuple[float, str]] = []
+    seen: set[str] = set()
+    for base in repos:
+        if _norm(base) in seen:
+            continue
+        group = [m for m in mirror_group(base) if _norm(m) not in seen]
+        seen.update(_norm(m) for m in group)
+
+        def key(m: str) -> tuple[bool, float]:
+            lat = median_latency(m)
+            return (lat is None, lat or 0.0)
+
+        for m in sorted(group, key=key):
+            remaining = open_remaining(m)
+            if remaining > 0:
+                skipped.append((remaining, m))
+                continue
+            ranked.append(m)
+
+    if not ranked and skipped:
+        probe = min(skipped)[1]
+        print(f"All repos are temporarily skipped after recent failures; trying {probe} anyway.")
+        print("Use 'pim repo reset' to retry all of them now.")
+        return [probe]
+    for remaining, m in skipped:
+        print(f"Skipping {m}: failing repo, retrying in {remaining:.0f}s")
+    return ranked
+
+def reset_stats(repos: list[str]) -> int:
+    """Forget the statistics (and close the breaker) of `repos`, or of every repo if empty."""
+    names: list[str] = []
+
+    def apply():
+        stats = _all_stats()
+        names.extend([_norm(r) for r in repos] if repos else list(stats.keys()))
+        for name in names:
+            stats.pop(name, None)
+    _update(apply)
+    print(f"Reset statistics of {len(names)} repo(s).")
+    return 0
+
+def repo_status(repos: list[str]) -> int:
+    """Print the recorded statistics for `repos` and any other repo seen before."""
+    with _lock:
+        known = list(_all_stats().keys())
+    names = [_norm(r) for r in repos]
+    for group in MIRROR_GROUPS:
+        names += [_norm(m) for m in group]
+    names += known
+    names = list(dict.fromkeys(names))
+
+    print("Repository status:")
+    for name in names:
+        with _lock:
+            stats = dict(_repo_stats(name))
+        successes = _int(stats.get("successes"))
+        failures = _int(stats.get("failures"))
+        total = successes + failures
+        lat = median_latency(name)
+        remaining = open_remaining(name)
+        last_failure = stats.get("last_failure")
+
+        if remaining > 0:
+            state = f"skipped ({remaining:.0f}s left)"
+        elif _int(stats.get("consecutive_failures")) >= BREAKER_THRESHOLD:
+            state = "retrying"
+        else:
+            state = "ok"
+        print(f" - {name}")
+        print(f"     state: {state}")
+        print("     success rate: " + (f"{successes / total * 100:.0f}% ({successes}/{total})" if total else "n/a"))
+        print("     median latency: " + (f"{lat * 1000:.0f} ms" if lat is not None else "n/a"))
+        if isinstance(last_failure, (int, float)):
+            print(f"     last failure: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(last_failure))}")
+    return 0
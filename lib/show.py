@@ -1,11 +1,17 @@
 import os
-import urllib.request
-from http.client import HTTPResponse
-from .find import find_pkg_in_repos
+from .find import find_info_in_repos, ReposUnreachableError
 from .parse import parse_info_text
-from .pimconfig import FETCH_TIMEOUT
+from .version import compare_versions
 
 def show_package(pkg_name: str, repos: list[str], target: str):
+    unreachable = None
+    try:
+        found = find_info_in_repos(pkg_name, repos)
+    except ReposUnreachableError as e:
+        found = None
+        unreachable = e
+    repo_info = parse_info_text(found[2]) if found else None
+
     local_info_path = os.path.join(target, pkg_name, f"{pkg_name}.info")
     if os.path.exists(local_info_path):
         with open(local_info_path, "r", encoding="utf-8") as f:
@@ -13,23 +19,24 @@ def show_package(pkg_name: str, repos: list[str], target: str):
         print(f"Information (installed) for {pkg_name}:")
         for k, v in info.items():
             print(f"{k}: {v}")
+
+        latest = repo_info.get("version") if repo_info else None
+        installed = info.get("version")
+        if latest:
+            newer = installed is None or compare_versions(installed, latest) < 0
+            print(f"latest (from repo): {latest}" + (" (update available)" if newer else ""))
+        elif unreachable:
+            print(f"latest (from repo): unknown, {unreachable}")
         return 0
 
-    pkg = find_pkg_in_repos(pkg_name, repos)  # pylint: disable=W0612 # type: ignore
-    if not pkg:
+    if unreachable:
+        print(f"'{pkg_name}' is not installed locally and {unreachable}.")
+        return 1
+    if not found or repo_info is None:
         print(f"'{pkg_name}' not found in repos nor is it installed locally.")
         return 1
-    _, _, info_url = pkg
 
-    try:
-        with urllib.request.urlopen(info_url, timeout=FETCH_TIMEOUT) as resp: # pyright: ignore[reportAny]
-            if not isinstance(resp, HTTPResponse): return None
-            info_text = resp.read().decode("utf-8")
-        info = parse_info_text(info_text)
-        print(f"Information (from repo) for {pkg_name}:")
-        for k, v in info.items():
-            print(f"{k}: {v}")
-        return 0
-    except Exception as e:
-        print(f"Could not get info from {info_url}: {e}")
-        return 1
+    print(f"Information (from repo) for {pkg_name}:")
+    for k, v in repo_info.items():
+        print(f"{k}: {v}")
+    return 0
@@ -0,0 +1,230 @@
+# pyright: reportUnusedCallResult=false
+import os
+import shutil
+import hashlib
+import tempfile
+import zipfile
+import urllib.request
+from .pimconfig import STORE_PATH, STORE_LINK_MODE, FETCH_TIMEOUT
+from .util.jsonfile import load_json, save_json
+from .util.lock import file_lock
+
+OBJECTS_DIR = os.path.join(STORE_PATH, "objects")
+INDEX_PATH = os.path.join(STORE_PATH, "index.json")
+REFS_PATH = os.path.join(STORE_PATH, "refs.json")
+LOCK_PATH = os.path.join(STORE_PATH, ".lock")
+MARKER_NAME = ".pim-store"
+
+def store_lock():
+    """
+    Lock the store against other pim processes. Hold it from looking up or adding a
+    package until its ref is recorded, so `store gc` can't remove it in between.
+    """
+    return file_lock(LOCK_PATH)
+
+def file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _source_key(zip_url: str, info_text: str) -> str:
+    return hashlib.sha256(f"{zip_url}\n{info_text}".encode("utf-8")).hexdigest()
+
+def object_path(pkg_hash: str) -> str:
+    return os.path.join(OBJECTS_DIR, pkg_hash)
+
+def zip_validators(zip_url: str) -> dict[str, str]:
+    """
+    Return the ETag, Last-Modified and Content-Length of `zip_url` (HEAD request), used
+    to tell whether a republished zip changed. Empty if the server gives none.
+    """
+    try:
+        req = urllib.request.Request(zip_url, method="HEAD")
+        with urllib.request.urlopen(req, timeout=FETCH_TIMEOUT) as resp: # pyright: ignore[reportAny]
+            headers = {
+                "etag": resp.headers.get("ETag"), # pyright: ignore[reportAny]
+                "last_modified": resp.headers.get("Last-Modified"), # pyright: ignore[reportAny]
+                "length": resp.headers.get("Content-Length"), # pyright: ignore[reportAny]
+            }
+    except Exception:
+        return {}
+    return {k: v for k, v in headers.items() if isinstance(v, str) and v}
+
+def _same_zip(recorded: dict[str, object], current: dict[str, str]) -> bool:
+    if recorded.get("etag") and current.get("etag"):
+        return recorded.get("etag") == current.get("etag")
+    if recorded.get("last_modified") and current.get("last_modified"):
+        return recorded.get("last_modified") == current.get("last_modified") and recorded.get("length") == current.get("length")
+    return False
+
+def store_lookup(zip_url: str, info: dict[str, str], info_text: str, validators: dict[str, str]) -> str | None:
+    """
+    Return the hash of an already stored package matching this repo entry, or None.
+    Uses the `sha256` field of the .info when present. Otherwise the hash recorded the
+    last time this zip URL and .info content were stored is only trusted if the zip's
+    `validators` (see zip_validators) are unchanged, so a republished zip is downloaded.
+    """
+    pkg_hash = info.get("sha256", "").lower()
+    if not pkg_hash:
+        entry = load_json(INDEX_PATH).get(_source_key(zip_url, info_text))
+        if isinstance(entry, dict) and _same_zip(entry, validators): # pyright: ignore[reportUnknownArgumentType]
+            pkg_hash = entry.get("hash") # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
+    if isinstance(pkg_hash, str) and pkg_hash and os.path.isdir(object_path(pkg_hash)):
+        return pkg_hash
+    return None
+
+def store_add(zip_path: str, pkg_name: str, zip_url: str, info: dict[str, str], info_text: str, validators: dict[str, str]) -> str:
+    """
+    Extract the downloaded zip into the store (once per hash) and return its hash.
+    `validators` are the zip's headers seen before downloading it. Hold store_lock().
+    Raises ValueError if the zip does not match the `sha256` declared in the .info.
+    """
+    pkg_hash = file_sha256(zip_path)
+    expected = info.get("sha256", "").lower()
+    if expected and expected != pkg_hash:
+        raise ValueError(f"hash mismatch (expected {expected}, got {pkg_hash})")
+
+    dest = object_path(pkg_hash)
+    if not os.path.isdir(dest):
+        os.makedirs(OBJECTS_DIR, exist_ok=True)
+        tmpdir = tempfile.mkdtemp(prefix=".tmp", dir=OBJECTS_DIR)
+        try:
+            with zipfile.ZipFile(zip_path, "r") as zf:
+                zf.extractall(tmpdir)
+            # respect if zip contains top-level folder pkg_name
+            candidate = os.path.join(tmpdir, pkg_name)
+            src = candidate if os.path.isdir(candidate) else tmpdir
+            try:
+                os.replace(src, dest)
+            except OSError:
+                # another instance stored the same hash meanwhile
+                if not os.path.isdir(dest):
+                    raise
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+    index = load_json(INDEX_PATH)
+    index[_source_key(zip_url, info_text)] = {"hash": pkg_hash, **validators}
+    save_json(INDEX_PATH, index)
+    return pkg_hash
+
+def _link_file(src: str, dst: str, mode: str) -> str:
+    if mode == "hardlink":
+        try:
+            os.link(src, dst)
+            return mode
+        except OSError:
+            pass
+    elif mode == "symlink":
+        try:
+            os.symlink(os.path.abspath(src), dst)
+            return mode
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+    return "copy"
+
+def link_tree(src: str, dst: str, mode: str = STORE_LINK_MODE) -> str:
+    """
+    Recreate the tree `src` at `dst` linking each file with `mode`. Falls back to a
+    copy where links are not possible. Returns the mode used for the last file.
+    Raises FileNotFoundError if `src` is missing (e.g. removed by `store gc`).
+    """
+    if not os.path.isdir(src):
+        raise FileNotFoundError(f"stored package not found: {src}")
+    used = mode
+    for root, _, files in os.walk(src):
+        rel = os.path.relpath(root, src)
+        out_dir = os.path.join(dst, rel) if rel != "." else dst
+        os.makedirs(out_dir, exist_ok=True)
+        for name in files:
+            used = _link_file(os.path.join(root, name), os.path.join(out_dir, name), mode)
+            if used == "copy":
+                # links don't work here (e.g. another drive); don't retry on every file
+                mode = "copy"
+    os.makedirs(dst, exist_ok=True)
+    return used
+
+def add_ref(pkg_hash: str, install_path: str):
+    """Record that `install_path` uses `pkg_hash`, so `store gc` keeps it. Hold store_lock()."""
+    with open(os.path.join(install_path, MARKER_NAME), "w", encoding="utf-8") as f:
+        f.write(pkg_hash)
+    refs = load_json(REFS_PATH)
+    paths = refs.get(pkg_hash)
+    paths = [p for p in paths if isinstance(p, str)] if isinstance(paths, list) else [] # pyright: ignore[reportUnknownVariableType]
+    abs_path = os.path.abspath(install_path)
+    if abs_path not in paths:
+        paths.append(abs_path)
+    refs[pkg_hash] = paths
+    save_json(REFS_PATH, refs)
+
+def _is_live_ref(pkg_hash: str, install_path: str) -> bool:
+    try:
+        with open(os.path.join(install_path, MARKER_NAME), "r", encoding="utf-8") as f:
+            return f.read().strip() == pkg_hash
+    except Exception:
+        return False
+
+def store_gc() -> int:
+    """Remove stored versions that no instance references anymore."""
+    if not os.path.isdir(OBJECTS_DIR):
+        print("Store is empty.")
+        return 0
+    try:
+        with store_lock():
+            removed, freed = _gc_objects()
+    except TimeoutError as e:
+        print(f"Store is busy, try again later: {e}")
+        return 1
+    print(f"Removed {removed} unreferenced version(s) from the store ({freed / 1024:.1f} KiB freed).")
+    return 0
+
+def _gc_objects() -> tuple[int, int]:
+    """Remove unreferenced objects; the caller holds store_lock(). Returns (removed, bytes freed)."""
+    refs = load_json(REFS_PATH)
+    live_refs: dict[str, object] = {}
+    for pkg_hash, paths in refs.items():
+        if not isinstance(paths, list):
+            continue
+        live = [p for p in paths if isinstance(p, str) and _is_live_ref(pkg_hash, p)] # pyright: ignore[reportUnknownVariableType]
+        if live:
+            live_refs[pkg_hash] = live
+
+    removed = 0
+    freed = 0
+    for pkg_hash in os.listdir(OBJECTS_DIR):
+        path = object_path(pkg_hash)
+        if pkg_hash.startswith(".") or pkg_hash in live_refs or not os.path.isdir(path):
+            continue
+        for root, _, files in os.walk(path):
+            for name in files:
+                try:
+                    freed += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    pass
+        shutil.rmtree(path, ignore_errors=True)
+        removed += 1
+
+    save_json(REFS_PATH, live_refs)
+    index = load_json(INDEX_PATH)
+    save_json(INDEX_PATH, {k: v for k, v in index.items() if isinstance(v, dict) and v.get("hash") in live_refs}) # pyright: ignore[reportUnknownMemberType]
+    return removed, freed
+
+def store_list() -> int:
+    """List stored versions and the instances referencing them."""
+    hashes = sorted(h for h in os.listdir(OBJECTS_DIR) if not h.startswith(".")) if os.path.isdir(OBJECTS_DIR) else []
+    if not hashes:
+        print("Store is empty.")
+        return 0
+
+    refs = load_json(REFS_PATH)
+    print(f"Store: {STORE_PATH}")
+    for pkg_hash in hashes:
+        paths = refs.get(pkg_hash)
+        live = [p for p in paths if isinstance(p, str) and _is_live_ref(pkg_hash, p)] if isinstance(paths, list) else [] # pyright: ignore[reportUnknownVariableType]
+        print(f" - {pkg_hash[:12]} ({len(live)} reference(s))")
+        for p in live:
+            print(f"     {p}")
+    return 0
@@ -1,10 +1,11 @@
 import os
-import shutil
+from .devregistry import unregister_editable
 from .msconfig.path.command import cfg_remove_command_path
+from .util.fs import remove_tree
 
 def uninstall_package(pkg_name: str, target: str):
     path = os.path.join(target, pkg_name)
-    if not os.path.exists(path):
+    if not os.path.lexists(path):
         print(f"Package '{pkg_name}' is not installed in {target}.")
         return 1
 
@@ -13,7 +14,9 @@ def uninstall_package(pkg_name: str, target: str):
     has_commands = os.path.isdir(commands_dir)
 
     try:
-        shutil.rmtree(path)
+        # editable installs are links: remove the link, never the source folder
+        remove_tree(path)
+        unregister_editable(pkg_name, target)
         print(f"Package '{pkg_name}' uninstalled.")
     except Exception as e:
         print(f"Could not uninstall '{pkg_name}': {e}")
@@ -0,0 +1,9 @@
+import os
+import shutil
+
+def remove_tree(path: str):
+    """Remove a directory, or just the link if `path` is a symlink (never its target)."""
+    if os.path.islink(path):
+        os.unlink(path)
+    else:
+        shutil.rmtree(path)
@@ -0,0 +1,21 @@
+# pyright: reportUnusedCallResult=false
+import os
+import json
+import tempfile
+
+def load_json(path: str) -> dict[str, object]:
+    """Load a JSON object from `path`. Returns an empty dict if missing or invalid."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f) # pyright: ignore[reportAny]
+        return data if isinstance(data, dict) else {} # pyright: ignore[reportUnknownVariableType]
+    except Exception:
+        return {}
+
+def save_json(path: str, data: dict[str, object]):
+    """Write `data` to `path` atomically, so concurrent instances never read a partial file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmpfd, tmpname = tempfile.mkstemp(dir=os.path.dirname(path))
+    with os.fdopen(tmpfd, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmpname, path)
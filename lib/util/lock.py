@@ -0,0 +1,38 @@
+# pyright: reportUnusedCallResult=false
+import os
+import time
+from contextlib import contextmanager
+from collections.abc import Iterator
+
+@contextmanager
+def file_lock(path: str, timeout: float = 60, stale: float = 600) -> Iterator[None]:
+    """
+    Hold an exclusive lock shared by all pim processes (e.g. every Minecraft instance)
+    by creating `path`. A lock older than `stale` seconds is assumed to be left behind
+    by a crashed process and is taken over. Raises TimeoutError after `timeout` seconds.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(path) > stale:
+                    os.remove(path)
+                    continue
+            except OSError:
+                continue # released meanwhile
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"could not lock {path}")
+            time.sleep(0.05)
+    try:
+        os.write(fd, str(os.getpid()).encode())
+        os.close(fd)
+        yield
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,34 @@
+import re
+
+def parse_version(version: str) -> tuple[tuple[tuple[int, int | str], ...], tuple[tuple[int, int | str], ...] | None]:
+    """
+    Parse a `major.minor.patch[-prerelease][+build]` style version into a sortable key.
+    Numeric parts compare as numbers, others as text, and a pre-release sorts before
+    its release (1.0.0-beta < 1.0.0). Build metadata is ignored.
+    """
+    version = version.strip().lstrip("vV").split("+", 1)[0]
+    release, _, pre = version.partition("-")
+
+    def parts(text: str) -> tuple[tuple[int, int | str], ...]:
+        # numbers sort before words when both appear in the same position
+        return tuple((0, int(p)) if p.isdigit() else (1, p.lower()) for p in re.split(r"[.\-_]", text) if p)
+
+    rel = list(parts(release))
+    # 1.0 == 1.0.0
+    while rel and rel[-1] == (0, 0):
+        rel.pop()
+    return tuple(rel), (parts(pre) if pre else None)
+
+def compare_versions(a: str, b: str) -> int:
+    """Return -1, 0 or 1 if version `a` is older, equal or newer than `b`."""
+    rel_a, pre_a = parse_version(a)
+    rel_b, pre_b = parse_version(b)
+    if rel_a != rel_b:
+        return -1 if rel_a < rel_b else 1
+    if pre_a == pre_b:
+        return 0
+    if pre_a is None:
+        return 1
+    if pre_b is None:
+        return -1
+    return -1 if pre_a < pre_b else 1